@@ -6,6 +6,15 @@ except ModuleNotFoundError:
     # when running as local module with run.sh
     from .models.sensor_host import SensorHost
 
+try:
+    import uvloop
+except ImportError:
+    # uvloop is optional and not available on Windows
+    uvloop = None
+
 
 if __name__ == '__main__':
-    asyncio.run(Module.run_from_registry())
+    if uvloop is not None:
+        uvloop.run(Module.run_from_registry())
+    else:
+        asyncio.run(Module.run_from_registry())
@@ -0,0 +1,94 @@
+"""Threaded HTTP server that serves pre-serialized sensor payloads from memory"""
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import unquote
+
+
+def payload_entry(data: bytes) -> Tuple[bytes, str]:
+    """Pair a payload with its ETag, computed once when the payload is stored"""
+    return data, f'"{zlib.crc32(data):08x}"'
+
+
+class PayloadRequestHandler(BaseHTTPRequestHandler):
+    """Serve `/{sensor_name}/current.json` straight from the server's in-memory payloads"""
+
+    # Buffer the response so headers and a small body are flushed together, and
+    # send without waiting on Nagle's algorithm
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    # Drop idle or stalled clients rather than holding a connection slot forever
+    timeout = 5
+
+    def do_GET(self):
+        self._send_payload(include_body=True)
+
+    def do_HEAD(self):
+        self._send_payload(include_body=False)
+
+    def _send_payload(self, include_body: bool):
+        path = self.path.split('?', 1)[0]
+        name = self.server.routes.get(path)
+        if name is None:
+            # Any other valid percent-encoding of a sensor name, e.g. lowercase hex
+            name = self.server.routes.get(unquote(path))
+        entry = self.server.payloads.get(name)
+        if entry is None:
+            self.send_error(404, "File not found")
+            return
+
+        data, etag = entry
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if include_body:
+            self.wfile.write(data)
+
+
+class BoundedHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that caps the number of connections handled at once"""
+
+    request_queue_size = 128
+    _OVERLOADED_RESPONSE = (
+        b"HTTP/1.0 503 Service Unavailable\r\n"
+        b"Retry-After: 1\r\n"
+        b"Content-Length: 0\r\n"
+        b"Connection: close\r\n\r\n"
+    )
+
+    def __init__(self, server_address, handler_class, max_connections: int = 32):
+        super().__init__(server_address, handler_class)
+        self._connection_slots = threading.BoundedSemaphore(max_connections)
+
+    def process_request(self, request, client_address):
+        # Shed load instead of blocking the accept loop, which would also stall shutdown()
+        if not self._connection_slots.acquire(blocking=False):
+            try:
+                # Tell the client it was shed; a short timeout keeps the accept loop moving
+                request.settimeout(0.1)
+                request.sendall(self._OVERLOADED_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._connection_slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._connection_slots.release()
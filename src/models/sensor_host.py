@@ -1,12 +1,10 @@
 from typing import (Any, ClassVar, Dict, Final, List, Mapping, Optional,
                     Sequence, Tuple)
 import asyncio
+import functools
 import json
-import os
-import tempfile
 import threading
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-import functools
+from urllib.parse import quote
 
 from typing_extensions import Self
 from viam.components.generic import *
@@ -18,6 +16,34 @@ from viam.resource.easy_resource import EasyResource
 from viam.resource.types import Model, ModelFamily
 from viam.utils import ValueTypes
 
+from .payload_server import BoundedHTTPServer, PayloadRequestHandler, payload_entry
+
+try:
+    import orjson
+except ImportError:
+    # fall back to the stdlib encoder if orjson is not installed
+    orjson = None
+
+# Payload key for the combined readings of every sensor; sensor names are never empty
+_ALL_PAYLOAD_KEY = ""
+
+
+def _dumps(readings: Mapping[str, Any]) -> bytes:
+    """Serialize sensor readings to compact JSON bytes"""
+    if orjson is not None:
+        try:
+            # Pass datetimes through to default=str so they keep the stdlib format
+            return orjson.dumps(
+                readings,
+                default=str,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        except orjson.JSONEncodeError:
+            # e.g. ints wider than 64 bits, which orjson rejects without calling default
+            pass
+    return json.dumps(readings, separators=(',', ':'), default=str).encode()
+
 
 class SensorHost(Generic, EasyResource):
     # To enable debug-level logging, either run viam-server with the --debug option,
@@ -31,10 +57,11 @@ class SensorHost(Generic, EasyResource):
         self.sensors: List[Sensor] = []
         self.port: int = 8080
         self.refresh_interval: float = 5.0
-        self.server: Optional[HTTPServer] = None
+        self.server: Optional[BoundedHTTPServer] = None
         self.server_thread: Optional[threading.Thread] = None
         self.refresh_task: Optional[asyncio.Task] = None
-        self.temp_dir: Optional[str] = None
+        # Latest serialized readings and their ETag per sensor name, served directly by the HTTP handler
+        self._payloads: Dict[str, Tuple[bytes, str]] = {}
         self.running = False
 
     @classmethod
@@ -53,6 +80,12 @@ class SensorHost(Generic, EasyResource):
         """
         return super().new(config, dependencies)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _sensor_resource_name(sensor_name: str) -> ResourceName:
+        """Memoized `Sensor.get_resource_name`, reused across reconfigures"""
+        return Sensor.get_resource_name(sensor_name)
+
     @classmethod
     def validate_config(
         cls, config: ComponentConfig
@@ -68,28 +101,27 @@ class SensorHost(Generic, EasyResource):
                 first element is a list of required dependencies and the
                 second element is a list of optional dependencies
         """
+        fields = config.attributes.fields
+        
         # Validate required configuration
-        if "sensors" not in config.attributes.fields:
+        if "sensors" not in fields:
             raise ValueError("'sensors' attribute is required")
         
-        sensor_names = config.attributes.fields["sensors"].list_value
-        if len(sensor_names.values) == 0:
+        sensor_names = [value.string_value for value in fields["sensors"].list_value.values]
+        if not sensor_names:
             raise ValueError("At least one sensor must be specified")
+        if not all(sensor_names):
+            raise ValueError("Sensor names must be non-empty strings")
         
-        if "port" not in config.attributes.fields:
+        if "port" not in fields:
             raise ValueError("'port' attribute is required")
         
-        port = config.attributes.fields["port"].number_value
+        port = fields["port"].number_value
         if port <= 0 or port > 65535:
             raise ValueError("Port must be between 1 and 65535")
         
-        # Extract sensor names for dependencies
-        required_deps = []
-        for sensor_value in sensor_names.values:
-            sensor_name = sensor_value.string_value
-            required_deps.append(sensor_name)
-        
-        return required_deps, []
+        # The sensor names are the required dependencies
+        return sensor_names, []
 
     def reconfigure(
         self, config: ComponentConfig, dependencies: Mapping[ResourceName, ResourceBase]
@@ -104,30 +136,26 @@ class SensorHost(Generic, EasyResource):
         self._stop_server()
         
         # Extract configuration
-        sensor_names = config.attributes.fields["sensors"].list_value
-        self.port = int(config.attributes.fields["port"].number_value)
+        fields = config.attributes.fields
+        sensor_names = [value.string_value for value in fields["sensors"].list_value.values]
+        self.port = int(fields["port"].number_value)
         
         # Optional refresh interval (default 5 seconds)
-        if "refresh" in config.attributes.fields:
-            self.refresh_interval = config.attributes.fields["refresh"].number_value
-            if self.refresh_interval <= 0:
-                self.refresh_interval = 5.0
+        refresh = fields.get("refresh")
+        if refresh is not None and refresh.number_value > 0:
+            self.refresh_interval = refresh.number_value
         else:
             self.refresh_interval = 5.0
         
         # Setup sensors from dependencies
         self.sensors = []
-        for sensor_value in sensor_names.values:
-            sensor_name = sensor_value.string_value
-            sensor_resource_name = Sensor.get_resource_name(sensor_name)
+        for sensor_name in sensor_names:
+            sensor_resource_name = self._sensor_resource_name(sensor_name)
             if sensor_resource_name in dependencies:
                 self.sensors.append(dependencies[sensor_resource_name])
             else:
                 self.logger.warning(f"Sensor '{sensor_name}' not found in dependencies")
         
-        # Setup temporary directory for JSON files
-        self._setup_temp_directory()
-        
         # Start web server and refresh task
         self._start_server()
         self._start_refresh_task()
@@ -150,9 +178,11 @@ class SensorHost(Generic, EasyResource):
                 "running": self.running,
                 "port": self.port,
                 "sensors": [sensor.name for sensor in self.sensors],
-                "refresh_interval": self.refresh_interval,
-                "temp_dir": self.temp_dir or ""
+                "refresh_interval": self.refresh_interval
             }
+        elif "all" in command:
+            data, _ = self._payloads.get(_ALL_PAYLOAD_KEY, (b"{}", ""))
+            return {"readings": json.loads(data)}
         elif "refresh_now" in command:
             if self.running:
                 await self._update_all_sensor_readings()
@@ -166,30 +196,27 @@ class SensorHost(Generic, EasyResource):
         self, *, extra: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None
     ) -> List[Geometry]:
         return []
-    
-    def _setup_temp_directory(self):
-        """Setup temporary directory structure for JSON files"""
-        if self.temp_dir:
-            import shutil
-            shutil.rmtree(self.temp_dir, ignore_errors=True)
-        
-        self.temp_dir = tempfile.mkdtemp(dir="/dev/shm", prefix="sensor_host_")
-        
-        # Create subdirectory for each sensor
-        for sensor in self.sensors:
-            sensor_dir = os.path.join(self.temp_dir, sensor.name)
-            os.makedirs(sensor_dir, exist_ok=True)
-            
-        self.logger.info(f"Created temp directory: {self.temp_dir}")
+
+    async def close(self):
+        """Stop the HTTP server and refresh task when the resource is removed"""
+        self._stop_server()
     
     def _start_server(self):
-        """Start HTTP server to serve JSON files"""
+        """Start HTTP server to serve the latest sensor payloads"""
         if self.server:
             return
             
         try:
-            handler = functools.partial(SimpleHTTPRequestHandler, directory=self.temp_dir)
-            self.server = HTTPServer(('0.0.0.0', self.port), handler)
+            # Handle each connection on its own thread so one slow client can't block the rest
+            self.server = BoundedHTTPServer(('0.0.0.0', self.port), PayloadRequestHandler)
+            # Shared with the handler; updated in place by the refresh task
+            self.server.payloads = self._payloads
+            # Request paths are resolved once here rather than parsed on every request
+            self.server.routes = {}
+            for sensor in self.sensors:
+                for path_name in (sensor.name, quote(sensor.name)):
+                    self.server.routes[f"/{path_name}/current.json"] = sensor.name
+            self.server.routes["/all.json"] = _ALL_PAYLOAD_KEY
             self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
             self.server_thread.start()
             self.logger.info(f"HTTP server started on port {self.port}")
@@ -204,18 +231,19 @@ class SensorHost(Generic, EasyResource):
             self.refresh_task = None
         
         if self.server:
-            self.server.shutdown()
+            # shutdown() waits for serve_forever() to return, so it would deadlock on the server thread
+            if threading.current_thread() is not self.server_thread:
+                self.server.shutdown()
             self.server.server_close()
             self.server = None
             
-        if self.server_thread and self.server_thread.is_alive():
-            self.server_thread.join(timeout=1.0)
+        if self.server_thread:
+            if self.server_thread.is_alive():
+                self.server_thread.join(timeout=0.1)
             self.server_thread = None
             
-        if self.temp_dir and os.path.exists(self.temp_dir):
-            import shutil
-            shutil.rmtree(self.temp_dir, ignore_errors=True)
-            self.temp_dir = None
+        # Drop readings so sensors removed by a reconfigure are no longer served
+        self._payloads.clear()
             
         self.running = False
         self.logger.info("HTTP server stopped and resources cleaned up")
@@ -225,15 +253,24 @@ class SensorHost(Generic, EasyResource):
         if self.refresh_task and not self.refresh_task.done():
             self.refresh_task.cancel()
             
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         self.refresh_task = loop.create_task(self._refresh_readings_loop())
         self.logger.info(f"Started refresh task with {self.refresh_interval}s interval")
     
     async def _refresh_readings_loop(self):
-        """Continuously refresh sensor readings and save to JSON files"""
+        """Continuously refresh sensor readings on a fixed cadence"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
         while self.running:
+            # Schedule against absolute deadlines so slow refreshes don't stretch the period
+            next_tick += self.refresh_interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # Fell behind; skip the missed ticks instead of refreshing back to back
+                next_tick += (-delay // self.refresh_interval + 1) * self.refresh_interval
+                delay = next_tick - loop.time()
             try:
-                await asyncio.sleep(self.refresh_interval)
+                await asyncio.sleep(delay)
                 await self._update_all_sensor_readings()
             except asyncio.CancelledError:
                 break
@@ -241,35 +278,31 @@ class SensorHost(Generic, EasyResource):
                 self.logger.error(f"Error in refresh loop: {e}")
     
     async def _update_all_sensor_readings(self):
-        """Update readings for all sensors"""
-        for sensor in self.sensors:
-            try:
-                await self._update_sensor_reading(sensor)
-            except Exception as e:
-                self.logger.error(f"Failed to update readings for sensor {sensor.name}: {e}")
+        """Update readings for all sensors concurrently"""
+        sensors = list(self.sensors)
+        results = await asyncio.gather(
+            *(self._update_sensor_reading(sensor) for sensor in sensors),
+            return_exceptions=True
+        )
+        for sensor, result in zip(sensors, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to update readings for sensor {sensor.name}: {result}")
+        
+        # Splice the already-serialized payloads together so clients can fetch everything at once
+        parts = [
+            json.dumps(sensor.name).encode() + b":" + self._payloads[sensor.name][0]
+            for sensor in sensors if sensor.name in self._payloads
+        ]
+        self._payloads[_ALL_PAYLOAD_KEY] = payload_entry(b"{" + b",".join(parts) + b"}")
     
     async def _update_sensor_reading(self, sensor: Sensor):
         """Update readings for a single sensor"""
         try:
             readings = await sensor.get_readings()
-            sensor_dir = os.path.join(self.temp_dir, sensor.name)
-            
-            # Write to temporary file first, then rename for atomic update
-            temp_file = os.path.join(sensor_dir, "next.json")
-            current_file = os.path.join(sensor_dir, "current.json")
-            
-            with open(temp_file, 'w') as f:
-                json.dump(readings, f, indent=2, default=str)
-            
-            # Atomic rename for consistent reads
-            os.replace(temp_file, current_file)
+            # A single dict store is atomic, so the HTTP thread never sees a partial payload
+            self._payloads[sensor.name] = payload_entry(_dumps(readings))
             
         except Exception as e:
             self.logger.error(f"Failed to get readings from sensor {sensor.name}: {e}")
             raise
-    
-    def __del__(self):
-        """Cleanup on object destruction"""
-        if self.running:
-            self._stop_server()
 
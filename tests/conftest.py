@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Import modules the same way src/main.py does
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
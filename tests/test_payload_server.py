@@ -0,0 +1,96 @@
+import http.client
+import socket
+import threading
+
+import pytest
+
+from models.payload_server import BoundedHTTPServer, PayloadRequestHandler, payload_entry
+
+PAYLOAD = b'{"temperature":21.5}'
+
+
+@pytest.fixture
+def server():
+    server = BoundedHTTPServer(("127.0.0.1", 0), PayloadRequestHandler)
+    server.payloads = {"my-sensor": payload_entry(PAYLOAD)}
+    server.routes = {"/my-sensor/current.json": "my-sensor"}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=1.0)
+
+
+def request(server, method, path, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    try:
+        conn.request(method, path, headers=headers or {})
+        response = conn.getresponse()
+        return response, response.read()
+    finally:
+        conn.close()
+
+
+def test_get_returns_payload(server):
+    response, body = request(server, "GET", "/my-sensor/current.json")
+    assert response.status == 200
+    assert body == PAYLOAD
+    assert response.getheader("Content-Length") == str(len(PAYLOAD))
+    assert response.getheader("Content-Type") == "application/json"
+    assert response.getheader("ETag") == payload_entry(PAYLOAD)[1]
+
+
+def test_head_has_no_body(server):
+    response, body = request(server, "HEAD", "/my-sensor/current.json")
+    assert response.status == 200
+    assert body == b""
+    assert response.getheader("Content-Length") == str(len(PAYLOAD))
+
+
+def test_matching_etag_returns_304(server):
+    etag = payload_entry(PAYLOAD)[1]
+    response, body = request(
+        server, "GET", "/my-sensor/current.json", {"If-None-Match": etag}
+    )
+    assert response.status == 304
+    assert body == b""
+
+
+def test_unknown_path_returns_404(server):
+    response, _ = request(server, "GET", "/other-sensor/current.json")
+    assert response.status == 404
+
+
+def test_percent_encoded_path_is_resolved(server):
+    response, body = request(server, "GET", "/my%2dsensor/current.json")
+    assert response.status == 200
+    assert body == PAYLOAD
+
+
+def test_http_09_request_returns_body(server):
+    with socket.create_connection(("127.0.0.1", server.server_port), timeout=5) as sock:
+        # http.server still reads a (empty) header block after a version-less request line
+        sock.sendall(b"GET /my-sensor/current.json\r\n\r\n")
+        received = b""
+        while chunk := sock.recv(4096):
+            received += chunk
+    # HTTP/0.9 responses are the bare body, without a status line or headers
+    assert received == PAYLOAD
+
+
+def test_overloaded_server_returns_503():
+    server = BoundedHTTPServer(("127.0.0.1", 0), PayloadRequestHandler, max_connections=1)
+    server.payloads = {}
+    server.routes = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with socket.create_connection(("127.0.0.1", server.server_port), timeout=5):
+            response, _ = request(server, "GET", "/my-sensor/current.json")
+        assert response.status == 503
+        assert response.getheader("Retry-After") == "1"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=1.0)